@@ -1,10 +1,20 @@
 import os
+import asyncio
+import collections
+import ssl
+import aiohttp
 import ccxt
+import ccxt.pro as ccxtpro
 import numpy as np
 import time
 import logging
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: much faster JSON decoding of exchange responses
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -13,40 +23,90 @@ SYMBOL = '1000SATS/USDT'
 ORDER_BOOK_DEPTH = 100  # Increased for more comprehensive analysis
 INITIAL_BALANCE = 100  # Starting balance in USDT
 TRADE_AMOUNT = 100  # Fixed amount in USDT to trade each time
-TRADE_INTERVAL_SECONDS = 2
 PROFIT_PERCENTAGE = 0.0044  # Minimum 0.44% profit target
 
 # Order Book Analysis Parameters
 VOLUME_IMBALANCE_THRESHOLD = 1.2  # 20% more volume on buy side than sell side
 
+# Derived constants, folded once instead of on every order book update
+# Bid/ask ratio threshold T expressed on the signed (B - A) / (B + A) scale: B / A > T <=> imbalance > (T - 1) / (T + 1)
+SIGNED_IMBALANCE_THRESHOLD = (VOLUME_IMBALANCE_THRESHOLD - 1) / (VOLUME_IMBALANCE_THRESHOLD + 1)
+PROFIT_MULTIPLIER = 1 + PROFIT_PERCENTAGE
+
 # Rate Limiting Parameters
 MAX_REQUESTS_PER_MINUTE = 1200
 RATE_LIMIT_SAFETY_FACTOR = 0.75
 
+# Connection Pool Parameters
+HTTP_POOL_SIZE = 64  # Maximum open connections across all hosts
+HTTP_POOL_SIZE_PER_HOST = 32
+HTTP_KEEPALIVE_SECONDS = 60
+
+# Logging Parameters
+STATUS_LOG_INTERVAL_SECONDS = 1  # Throttle for the per-update status lines, which would otherwise log on every depth update
+
+# PNL Tracking Parameters
+PNL_HISTORY_LENGTH = 36000  # Most recent total values kept; about an hour of depth updates at 100 ms
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize Binance API with rate limiting
-exchange = ccxt.binance({
+# Initialize Binance API with rate limiting (ccxt.pro streams market data over websockets)
+exchange = ccxtpro.binance({
     'apiKey': os.getenv('BINANCE_API_KEY'),
     'secret': os.getenv('BINANCE_API_SECRET'),
     'enableRateLimit': True,
     'rateLimit': int((60 / MAX_REQUESTS_PER_MINUTE) * 1000 / RATE_LIMIT_SAFETY_FACTOR)
 })
 
-def fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH):
+def parse_json(http_response):
+    # Same contract as ccxt's Exchange.parse_json, but decoded with orjson
     try:
-        return exchange.fetch_order_book(symbol, limit=limit)
+        if exchange.is_json_encoded_object(http_response):
+            return orjson.loads(http_response)
+    except ValueError:
+        pass
+    return None
+
+if orjson is not None:
+    exchange.parse_json = parse_json
+
+def open_http_session():
+    # Replace ccxt's default connector with a larger keep-alive pool so websocket connections and
+    # REST calls reuse live sockets instead of paying a fresh TCP+TLS handshake
+    exchange.tcp_connector = aiohttp.TCPConnector(
+        ssl=ssl.create_default_context(cafile=exchange.cafile),
+        limit=HTTP_POOL_SIZE,
+        limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        enable_cleanup_closed=True
+    )
+    exchange.session = aiohttp.ClientSession(connector=exchange.tcp_connector, trust_env=exchange.aiohttp_trust_env)
+
+async def fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH):
+    try:
+        # Resolves on the next depth update pushed over the websocket
+        return await exchange.watch_order_book(symbol, limit=limit)
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
     return None
 
+# Reused [price, volume] buffers, so analyzing an update does not allocate fresh arrays
+ask_buffer = np.empty((ORDER_BOOK_DEPTH, 2), dtype=np.float64)
+bid_buffer = np.empty((ORDER_BOOK_DEPTH, 2), dtype=np.float64)
+
+def fill_buffer(buffer, levels):
+    # Copy the levels into the front of a preallocated buffer and return that view
+    view = buffer[:len(levels)]
+    view[...] = levels
+    return view
+
 def analyze_order_book(order_book):
     asks = order_book['asks']
     bids = order_book['bids']
@@ -59,30 +119,38 @@ def analyze_order_book(order_book):
     best_ask_price, best_ask_volume = asks[0]
     best_bid_price, best_bid_volume = bids[0]
     
-    # Calculate buy/sell volume imbalance
-    total_bid_volume = sum(volume for price, volume in bids)
-    total_ask_volume = sum(volume for price, volume in asks)
-    volume_imbalance = total_bid_volume / total_ask_volume
+    # Calculate buy/sell volume imbalance (vectorized over the [price, volume] levels)
+    asks_np = fill_buffer(ask_buffer, asks)
+    bids_np = fill_buffer(bid_buffer, bids)
+    total_bid_volume = float(bids_np[:, 1].sum())
+    total_ask_volume = float(asks_np[:, 1].sum())
+    volume_imbalance = (total_bid_volume - total_ask_volume) / (total_bid_volume + total_ask_volume)
 
     # Calculate ideal exit price based on profit percentage
-    min_exit_price = best_ask_price * (1 + PROFIT_PERCENTAGE)
+    min_exit_price = best_ask_price * PROFIT_MULTIPLIER
+
+    # Sell level: first ask above the exit price, found on the same ask array (asks are sorted ascending)
+    ask_prices = asks_np[:, 0]
+    sell_idx = np.searchsorted(ask_prices, min_exit_price, side='right')
+    sell_price = float(ask_prices[sell_idx]) if sell_idx < len(ask_prices) else min_exit_price
     
     # Determine market condition
     market_condition = 'neutral'
-    if volume_imbalance > VOLUME_IMBALANCE_THRESHOLD:
+    if volume_imbalance > SIGNED_IMBALANCE_THRESHOLD:
         market_condition = 'bullish'
-    elif volume_imbalance < 1 / VOLUME_IMBALANCE_THRESHOLD:
+    elif volume_imbalance < -SIGNED_IMBALANCE_THRESHOLD:
         market_condition = 'bearish'
     
     return {
         'best_ask_price': best_ask_price,
         'best_bid_price': best_bid_price,
         'min_exit_price': min_exit_price,
-        'market_condition': market_condition
+        'market_condition': market_condition,
+        'sell_price': sell_price
     }
 
 def place_order(symbol, side, price, amount):
-    logger.info(f"Placing {side} order: {amount:.8f} {symbol} at {price:.8f}")
+    logger.info("Placing %s order: %.8f %s at %.8f", side, amount, symbol, price)
     # In a real implementation, you would call the exchange's API here
     return {
         'symbol': symbol,
@@ -101,21 +169,17 @@ def update_order_status(order, current_price):
             order['status'] = 'filled'
     return order
 
-def simulate_trading(symbol):
+async def simulate_trading(symbol):
     balance = INITIAL_BALANCE
     symbol_balance = 0
-    pnl = []
+    pnl = collections.deque(maxlen=PNL_HISTORY_LENGTH)  # Bounded, since it grows on every depth update
     active_trade = None
-    last_api_call_time = time.time()
     previous_market_condition = 'neutral'
+    last_status_log_time = 0.0
 
     while True:
-        time_since_last_call = time.time() - last_api_call_time
-        if time_since_last_call < TRADE_INTERVAL_SECONDS:
-            time.sleep(TRADE_INTERVAL_SECONDS - time_since_last_call)
-        
-        order_book = fetch_order_book(symbol)
-        last_api_call_time = time.time()
+        # Blocks until the exchange pushes the next order book update
+        order_book = await fetch_order_book(symbol)
         
         if order_book is None:
             logger.warning("Failed to fetch order book. Skipping this iteration.")
@@ -128,43 +192,41 @@ def simulate_trading(symbol):
         
         current_price = order_book['asks'][0][0]  # Current market price based on the first ask
 
-        logger.info(f"Market condition: {analysis['market_condition']}")
+        # The per-update status lines are only built at most once per STATUS_LOG_INTERVAL_SECONDS
+        now = time.monotonic()
+        log_status = now - last_status_log_time >= STATUS_LOG_INTERVAL_SECONDS and logger.isEnabledFor(logging.INFO)
+        if log_status:
+            last_status_log_time = now
+            logger.info("Market condition: %s", analysis['market_condition'])
 
-        if (previous_market_condition in ['neutral', 'bearish'] and 
+        if (previous_market_condition in {'neutral', 'bearish'} and 
             analysis['market_condition'] == 'bullish'):
             # Bullish trend detected from neutral or bearish market condition
             if active_trade is None and balance >= TRADE_AMOUNT:
                 buy_price = analysis['best_ask_price']
                 amount_to_buy = TRADE_AMOUNT / buy_price
                 active_trade = place_order(symbol, 'buy', buy_price, amount_to_buy)
-                logger.info(f"Placing buy order at best ask price: {buy_price:.8f}")
+                logger.info("Placing buy order at best ask price: %.8f", buy_price)
 
         previous_market_condition = analysis['market_condition']
 
         if active_trade and active_trade['side'] == 'buy':
             active_trade = update_order_status(active_trade, current_price)
             if active_trade['status'] == 'filled':
-                logger.info(f"BUY filled at {active_trade['price']:.8f}")
+                logger.info("BUY filled at %.8f", active_trade['price'])
                 symbol_balance += active_trade['amount']
                 balance -= TRADE_AMOUNT
                 
-                # Determine the sell price for at least 0.44% profit
-                min_sell_price = analysis['min_exit_price']
-                # Find the highest possible sell price in the order book that meets the profit target
-                for ask_price, ask_volume in order_book['asks']:
-                    if ask_price > min_sell_price:
-                        sell_price = ask_price
-                        break
-                else:
-                    sell_price = min_sell_price
+                # Sell at the first ask above the 0.44% profit target, as located by analyze_order_book
+                sell_price = analysis['sell_price']
 
                 active_trade = place_order(symbol, 'sell', sell_price, active_trade['amount'])
-                logger.info(f"Placing sell order at price: {sell_price:.8f}")
+                logger.info("Placing sell order at price: %.8f", sell_price)
 
         elif active_trade and active_trade['side'] == 'sell':
             active_trade = update_order_status(active_trade, current_price)
             if active_trade['status'] == 'filled':
-                logger.info(f"SELL filled at {active_trade['price']:.8f}")
+                logger.info("SELL filled at %.8f", active_trade['price'])
                 balance += active_trade['amount'] * active_trade['price']
                 symbol_balance -= active_trade['amount']
                 active_trade = None  # Ready for the next trade cycle
@@ -172,17 +234,22 @@ def simulate_trading(symbol):
         total_value = balance + symbol_balance * current_price
         pnl.append(total_value)
 
-        logger.info(f"Current Balance: {balance:.2f} USDT, "
-                    f"Symbol Balance: {symbol_balance:.8f}, "
-                    f"Total Value: {total_value:.2f}, "
-                    f"PNL: {total_value - INITIAL_BALANCE:.2f}")
+        if log_status:
+            logger.info("Current Balance: %.2f USDT, "
+                        "Symbol Balance: %.8f, "
+                        "Total Value: %.2f, "
+                        "PNL: %.2f", balance, symbol_balance, total_value, total_value - INITIAL_BALANCE)
 
         yield pnl, balance, symbol_balance, total_value
 
-def main():
+async def main():
+    open_http_session()
     trading_data = simulate_trading(SYMBOL)
-    for _ in trading_data:
-        pass  # The logging is done inside the simulate_trading function
+    try:
+        async for _ in trading_data:
+            pass  # The logging is done inside the simulate_trading function
+    finally:
+        await exchange.close()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
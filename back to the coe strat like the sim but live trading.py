@@ -1,129 +1,280 @@
 import os
+import asyncio
+import ssl
+import aiohttp
 import ccxt
+import ccxt.pro as ccxtpro
+import numpy as np
 import time
 import logging
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: much faster JSON decoding of exchange responses
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
 # Configurable Parameters
 SYMBOL = '1000SATS/USDT'
+BASE_ASSET, QUOTE_ASSET = SYMBOL.split('/')  # Split once rather than on every balance lookup
 ORDER_BOOK_DEPTH = 100  # Increased for more comprehensive analysis
 TRADE_AMOUNT = 100  # Fixed amount in USDT to trade each time
-TRADE_INTERVAL_SECONDS = 2
 PROFIT_PERCENTAGE = 0.0044  # Minimum 0.44% profit target
 
 # Order Book Analysis Parameters
 VOLUME_IMBALANCE_THRESHOLD = 1.2  # 20% more volume on buy side than sell side
 
+# Derived constants, folded once instead of on every order book update
+# Bid/ask ratio threshold T expressed on the signed (B - A) / (B + A) scale: B / A > T <=> imbalance > (T - 1) / (T + 1)
+SIGNED_IMBALANCE_THRESHOLD = (VOLUME_IMBALANCE_THRESHOLD - 1) / (VOLUME_IMBALANCE_THRESHOLD + 1)
+PROFIT_MULTIPLIER = 1 + PROFIT_PERCENTAGE
+
 # Rate Limiting Parameters
 MAX_REQUESTS_PER_MINUTE = 1200
 RATE_LIMIT_SAFETY_FACTOR = 0.75
 
+# Connection Pool Parameters
+HTTP_POOL_SIZE = 64  # Maximum open connections across all hosts
+HTTP_POOL_SIZE_PER_HOST = 32
+HTTP_KEEPALIVE_SECONDS = 60
+
+# Logging Parameters
+STATUS_LOG_INTERVAL_SECONDS = 1  # Throttle for the per-update status lines, which would otherwise log on every depth update
+
+# User Data Stream Parameters
+STREAM_RETRY_SECONDS = 5  # Back-off before resubscribing after a stream error
+BALANCE_RECONCILE_SECONDS = 60  # Periodic REST resync of the streamed balances
+OPEN_ORDERS_RECONCILE_SECONDS = 300  # Periodic REST resync of the locally tracked open orders
+BALANCE_SETTLE_TIMEOUT_SECONDS = 15  # Longest wait for a filled buy to be credited before selling
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize Binance API with rate limiting
-exchange = ccxt.binance({
+# Initialize Binance API with rate limiting (ccxt.pro streams market data over websockets)
+exchange = ccxtpro.binance({
     'apiKey': os.getenv('BINANCE_API_KEY'),
     'secret': os.getenv('BINANCE_API_SECRET'),
     'enableRateLimit': True,
-    'rateLimit': int((60 / MAX_REQUESTS_PER_MINUTE) * 1000 / RATE_LIMIT_SAFETY_FACTOR)
+    'rateLimit': int((60 / MAX_REQUESTS_PER_MINUTE) * 1000 / RATE_LIMIT_SAFETY_FACTOR),
+    'options': {
+        'watchBalance': {'fetchBalanceSnapshot': True}  # Seed the balance stream with a full snapshot
+    }
 })
 
-def fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH):
+# Account state pushed over the Binance user data stream
+balance_cache = {}
+balance_updated = None  # asyncio.Event set whenever the balance stream delivers an update; created in main()
+open_order_ids = set()  # Also updated locally on placement so no REST call is needed per tick
+stream_closed_order_ids = set()  # Ids the order stream reported as finished, possibly before their REST placement returned
+CLOSED_ORDER_STATUSES = ('closed', 'canceled', 'expired', 'rejected')
+
+def parse_json(http_response):
+    # Same contract as ccxt's Exchange.parse_json, but decoded with orjson
+    try:
+        if exchange.is_json_encoded_object(http_response):
+            return orjson.loads(http_response)
+    except ValueError:
+        pass
+    return None
+
+if orjson is not None:
+    exchange.parse_json = parse_json
+
+def open_http_session():
+    # Replace ccxt's default connector with a larger keep-alive pool so websocket connections and
+    # REST calls reuse live sockets instead of paying a fresh TCP+TLS handshake
+    exchange.tcp_connector = aiohttp.TCPConnector(
+        ssl=ssl.create_default_context(cafile=exchange.cafile),
+        limit=HTTP_POOL_SIZE,
+        limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        enable_cleanup_closed=True
+    )
+    exchange.session = aiohttp.ClientSession(connector=exchange.tcp_connector, trust_env=exchange.aiohttp_trust_env)
+
+async def fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH):
     try:
-        return exchange.fetch_order_book(symbol, limit=limit)
+        # Resolves on the next depth update pushed over the websocket
+        return await exchange.watch_order_book(symbol, limit=limit)
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
     return None
 
+# Reused [price, volume] buffers, so analyzing an update does not allocate fresh arrays
+ask_buffer = np.empty((ORDER_BOOK_DEPTH, 2), dtype=np.float64)
+bid_buffer = np.empty((ORDER_BOOK_DEPTH, 2), dtype=np.float64)
+
+def fill_buffer(buffer, levels):
+    # Copy the levels into the front of a preallocated buffer and return that view
+    view = buffer[:len(levels)]
+    view[...] = levels
+    return view
+
 def analyze_order_book(order_book):
-    asks = order_book['asks'][:15]  # Top 10 asks
+    asks = order_book['asks']  # Full depth, kept for the sell level search below
     bids = order_book['bids'][:15]  # Top 10 bids
     
     if not asks or not bids:
         logger.warning("Not enough asks or bids in the order book for analysis.")
         return None
     
-    # Calculate buy/sell volume imbalance
-    total_bid_volume = sum(volume for price, volume in bids)
-    total_ask_volume = sum(volume for price, volume in asks)
-    volume_imbalance = total_bid_volume / total_ask_volume
+    # Calculate buy/sell volume imbalance (vectorized over the [price, volume] levels)
+    all_asks_np = fill_buffer(ask_buffer, asks)
+    asks_np = all_asks_np[:15]  # Top 10 asks
+    bids_np = fill_buffer(bid_buffer, bids)
+    total_bid_volume = float(bids_np[:, 1].sum())
+    total_ask_volume = float(asks_np[:, 1].sum())
+    volume_imbalance = (total_bid_volume - total_ask_volume) / (total_bid_volume + total_ask_volume)
 
     # Calculate ideal exit price based on profit percentage
-    min_exit_price = min(ask[0] for ask in asks) * (1 + PROFIT_PERCENTAGE)
+    best_ask_price = float(asks_np[:, 0].min())
+    best_bid_price = float(bids_np[:, 0].max())
+    min_exit_price = best_ask_price * PROFIT_MULTIPLIER
+
+    # Sell level: first ask above the exit price, found on the same ask buffer (asks are sorted ascending)
+    ask_prices = all_asks_np[:, 0]
+    sell_idx = np.searchsorted(ask_prices, min_exit_price, side='right')
+    sell_price = float(ask_prices[sell_idx]) if sell_idx < len(ask_prices) else min_exit_price
     
     # Determine market condition
     market_condition = 'neutral'
-    if volume_imbalance > VOLUME_IMBALANCE_THRESHOLD:
+    if volume_imbalance > SIGNED_IMBALANCE_THRESHOLD:
         market_condition = 'bullish'
-    elif volume_imbalance < 1 / VOLUME_IMBALANCE_THRESHOLD:
+    elif volume_imbalance < -SIGNED_IMBALANCE_THRESHOLD:
         market_condition = 'bearish'
     
     return {
-        'best_ask_price': min(ask[0] for ask in asks),
-        'best_bid_price': max(bid[0] for bid in bids),
+        'best_ask_price': best_ask_price,
+        'best_bid_price': best_bid_price,
         'min_exit_price': min_exit_price,
-        'market_condition': market_condition
+        'market_condition': market_condition,
+        'sell_price': sell_price
     }
 
-def place_order(symbol, side, amount, price=None):
+async def place_order(symbol, side, amount, price=None):
     try:
         if side == 'buy':
-            order = exchange.create_limit_buy_order(symbol, amount, price)
+            order = await exchange.create_limit_buy_order(symbol, amount, price)
         else:
-            order = exchange.create_limit_sell_order(symbol, amount, price)
-        logger.info(f"Placed {side} order: {amount:.8f} {symbol} at {price:.8f}")
+            order = await exchange.create_limit_sell_order(symbol, amount, price)
+        logger.info("Placed %s order: %.8f %s at %.8f", side, amount, symbol, price)
+        # An order that filled on placement may already have been reported by the order stream,
+        # either in the REST response itself or as a stream event that arrived before it
+        if order['status'] not in CLOSED_ORDER_STATUSES and order['id'] not in stream_closed_order_ids:
+            open_order_ids.add(order['id'])
+        stream_closed_order_ids.discard(order['id'])
         return order
     except ccxt.BaseError as e:
-        logger.error(f"Error placing {side} order: {e}")
+        logger.error("Error placing %s order: %s", side, e)
         return None
 
-def get_current_balance(asset):
+async def load_balances():
+    # REST snapshot of the balance cache; used at startup and for periodic reconciliation
     try:
-        balance = exchange.fetch_balance()
-        return balance['free'][asset]
+        balance_cache.update(await exchange.fetch_balance())
+        return True
     except ccxt.BaseError as e:
-        logger.error(f"Error fetching balance: {e}")
+        logger.error("Error fetching balance: %s", e)
+        return False
+
+async def get_current_balance(asset):
+    # Served from the user data stream once it has been seeded; REST is only the cold-start path
+    if not balance_cache and not await load_balances():
         return 0
+    return balance_cache['free'][asset]
 
-def check_open_orders(symbol):
+async def watch_balance_loop():
+    while True:
+        try:
+            balance_cache.update(await exchange.watch_balance())
+            balance_updated.set()
+        except ccxt.BaseError as e:
+            logger.error("Balance stream error: %s", e)
+            await asyncio.sleep(STREAM_RETRY_SECONDS)
+
+async def wait_for_balance_change(asset, previous_total, timeout=BALANCE_SETTLE_TIMEOUT_SECONDS):
+    # Returns as soon as the streamed balance of `asset` differs from previous_total, or after timeout.
+    # Awaiting here keeps the event loop free, so the order book and user data streams stay current.
+    async def changed():
+        while balance_cache.get('total', {}).get(asset) == previous_total:
+            balance_updated.clear()
+            await balance_updated.wait()
     try:
-        open_orders = exchange.fetch_open_orders(symbol)
-        return len(open_orders) > 0
+        await asyncio.wait_for(changed(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("No %s balance update within %ss. Continuing with the cached balance.", asset, timeout)
+
+async def reconcile_balances_loop():
+    while True:
+        await asyncio.sleep(BALANCE_RECONCILE_SECONDS)
+        await load_balances()
+
+async def load_open_orders(symbol):
+    # REST resync of the local open-order set; used at startup and for periodic reconciliation
+    try:
+        open_orders = await exchange.fetch_open_orders(symbol)
+        open_order_ids.clear()
+        open_order_ids.update(order['id'] for order in open_orders)
+        stream_closed_order_ids.clear()  # The REST snapshot supersedes anything the stream reported before it
+        return True
     except ccxt.BaseError as e:
-        logger.error(f"Error fetching open orders: {e}")
+        logger.error("Error fetching open orders: %s", e)
         return False
 
-def trading_bot(symbol):
+def check_open_orders(symbol):
+    return bool(open_order_ids)
+
+async def watch_orders_loop(symbol):
+    while True:
+        try:
+            for order in await exchange.watch_orders(symbol):
+                if order['status'] == 'open':
+                    open_order_ids.add(order['id'])
+                else:
+                    open_order_ids.discard(order['id'])
+                    stream_closed_order_ids.add(order['id'])
+        except ccxt.BaseError as e:
+            logger.error("Order stream error: %s", e)
+            await asyncio.sleep(STREAM_RETRY_SECONDS)
+
+async def reconcile_open_orders_loop(symbol):
+    while True:
+        await asyncio.sleep(OPEN_ORDERS_RECONCILE_SECONDS)
+        await load_open_orders(symbol)
+
+async def trading_bot(symbol):
     balance = TRADE_AMOUNT
     symbol_balance = 0
     active_trade = None
-    last_api_call_time = time.time()
     previous_market_condition = 'neutral'
+    last_status_log_time = 0.0
 
     while True:
-        time_since_last_call = time.time() - last_api_call_time
-        if time_since_last_call < TRADE_INTERVAL_SECONDS:
-            time.sleep(TRADE_INTERVAL_SECONDS - time_since_last_call)
-        
-        order_book = fetch_order_book(symbol)
-        last_api_call_time = time.time()
+        # Blocks until the exchange pushes the next order book update
+        order_book = await fetch_order_book(symbol)
         
         if order_book is None:
             logger.warning("Failed to fetch order book. Skipping this iteration.")
             continue
 
+        # The per-update status lines are only built at most once per STATUS_LOG_INTERVAL_SECONDS
+        now = time.monotonic()
+        log_status = now - last_status_log_time >= STATUS_LOG_INTERVAL_SECONDS and logger.isEnabledFor(logging.INFO)
+        if log_status:
+            last_status_log_time = now
+
         if check_open_orders(symbol):
-            logger.info("Open orders detected. Skipping this iteration.")
+            if log_status:
+                logger.info("Open orders detected. Skipping this iteration.")
             continue
 
         analysis = analyze_order_book(order_book)
@@ -133,59 +284,70 @@ def trading_bot(symbol):
         
         current_price = order_book['asks'][0][0]  # Current market price based on the first ask
 
-        logger.info(f"Market condition: {analysis['market_condition']}")
+        if log_status:
+            logger.info("Market condition: %s", analysis['market_condition'])
 
         # Buy condition: market condition must change from bearish or neutral to bullish
-        if previous_market_condition in ['neutral', 'bearish'] and analysis['market_condition'] == 'bullish':
+        if previous_market_condition in {'neutral', 'bearish'} and analysis['market_condition'] == 'bullish':
             if active_trade is None and balance >= TRADE_AMOUNT:
                 buy_price = analysis['best_ask_price']
                 amount_to_buy = TRADE_AMOUNT / buy_price
-                active_trade = place_order(symbol, 'buy', amount_to_buy, buy_price)
-                logger.info(f"Placing buy order at best ask price: {buy_price:.8f}")
+                base_total_before_buy = balance_cache.get('total', {}).get(BASE_ASSET)
+                active_trade = await place_order(symbol, 'buy', amount_to_buy, buy_price)
+                logger.info("Placing buy order at best ask price: %.8f", buy_price)
 
         previous_market_condition = analysis['market_condition']
 
         if active_trade and active_trade['side'] == 'buy':
-            order = exchange.fetch_order(active_trade['id'], symbol)
+            order = await exchange.fetch_order(active_trade['id'], symbol)
             if order['status'] == 'closed':
-                logger.info(f"BUY filled at {order['price']:.8f}")
+                logger.info("BUY filled at %.8f", order['price'])
                 symbol_balance += order['amount']
                 balance -= TRADE_AMOUNT
                 
-                # Determine the sell price for at least 0.44% profit
-                min_sell_price = analysis['min_exit_price']
-                # Find the highest possible sell price in the order book that meets the profit target
-                for ask_price, ask_volume in order_book['asks']:
-                    if ask_price > min_sell_price:
-                        sell_price = ask_price
-                        break
-                else:
-                    sell_price = min_sell_price
+                # Sell at the first ask above the 0.44% profit target, found by analyze_order_book
+                sell_price = analysis['sell_price']
                 
-                asset = symbol.split('/')[0]
-                symbol_balance = get_current_balance(asset)
+                # Wait for the bought amount to be credited (up to BALANCE_SETTLE_TIMEOUT_SECONDS) before selling
+                await wait_for_balance_change(BASE_ASSET, base_total_before_buy)
+                symbol_balance = await get_current_balance(BASE_ASSET)
                 amount_to_sell = round(symbol_balance, 8)  # Round down to avoid over-selling
                 
-                active_trade = place_order(symbol, 'sell', amount_to_sell, sell_price)
-                logger.info(f"Placing sell order at price: {sell_price:.8f}")
+                active_trade = await place_order(symbol, 'sell', amount_to_sell, sell_price)
+                logger.info("Placing sell order at price: %.8f", sell_price)
 
         elif active_trade and active_trade['side'] == 'sell':
-            order = exchange.fetch_order(active_trade['id'], symbol)
+            order = await exchange.fetch_order(active_trade['id'], symbol)
             if order['status'] == 'closed':
-                logger.info(f"SELL filled at {order['price']:.8f}")
+                logger.info("SELL filled at %.8f", order['price'])
                 balance += order['amount'] * order['price']
                 symbol_balance -= order['amount']
                 active_trade = None  # Ready for the next trade cycle
 
-        total_value = balance + symbol_balance * current_price
+        if log_status:
+            total_value = balance + symbol_balance * current_price
+            logger.info("Current Balance: %.2f USDT, "
+                        "Symbol Balance: %.8f, "
+                        "Total Value: %.2f, "
+                        "PNL: %.2f", balance, symbol_balance, total_value, total_value - TRADE_AMOUNT)
 
-        logger.info(f"Current Balance: {balance:.2f} USDT, "
-                    f"Symbol Balance: {symbol_balance:.8f}, "
-                    f"Total Value: {total_value:.2f}, "
-                    f"PNL: {total_value - TRADE_AMOUNT:.2f}")
-
-def main():
-    trading_bot(SYMBOL)
+async def main():
+    global balance_updated
+    balance_updated = asyncio.Event()
+    open_http_session()
+    await load_open_orders(SYMBOL)
+    watchers = [
+        asyncio.create_task(watch_balance_loop()),
+        asyncio.create_task(reconcile_balances_loop()),
+        asyncio.create_task(watch_orders_loop(SYMBOL)),
+        asyncio.create_task(reconcile_open_orders_loop(SYMBOL))
+    ]
+    try:
+        await trading_bot(SYMBOL)
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+        await exchange.close()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
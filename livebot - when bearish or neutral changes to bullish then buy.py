@@ -1,10 +1,28 @@
 import os
+import asyncio
+import collections
+import ssl
+import signal
+import aiohttp
 import ccxt
+import ccxt.pro as ccxtpro
+import numpy as np
 import time
 import logging
 from dotenv import load_dotenv
 from math import floor
 
+try:
+    import orjson  # Optional: much faster JSON decoding of exchange responses
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    import httpx  # Optional: multiplexes REST calls over one HTTP/2 connection (pip install "httpx[http2]")
+except ImportError:
+    httpx = None
+
 # Load environment variables
 load_dotenv()
 
@@ -12,55 +30,201 @@ load_dotenv()
 SYMBOL = '1000SATS/USDT'
 ORDER_BOOK_DEPTH = 100  # Increased for more comprehensive analysis
 TRADE_AMOUNT = 200  # Fixed amount in USDT to trade each time
-TRADE_INTERVAL_SECONDS = 2
 PROFIT_PERCENTAGE = 0.0044  # Minimum 0.44% profit target
 
 # Order Book Analysis Parameters
 VOLUME_IMBALANCE_THRESHOLD = 1.2  # 20% more volume on buy side than sell side
 MAX_SYMBOL_BALANCE_USDT_EQUIV = 50  # Maximum symbol balance in USDT equivalent
 
+# Derived constants, folded once instead of on every order book update
+# Bid/ask ratio threshold T expressed on the signed (B - A) / (B + A) scale: B / A > T <=> imbalance > (T - 1) / (T + 1)
+SIGNED_IMBALANCE_THRESHOLD = (VOLUME_IMBALANCE_THRESHOLD - 1) / (VOLUME_IMBALANCE_THRESHOLD + 1)
+PROFIT_MULTIPLIER = 1 + PROFIT_PERCENTAGE
+
 # Rate Limiting Parameters
 MAX_REQUESTS_PER_MINUTE = 1200
 RATE_LIMIT_SAFETY_FACTOR = 0.75
 
+# Connection Pool Parameters
+HTTP_POOL_SIZE = 64  # Maximum open connections across all hosts
+HTTP_POOL_SIZE_PER_HOST = 32
+HTTP_KEEPALIVE_SECONDS = 60
+USE_HTTP2 = False  # Opt-in: send REST calls over HTTP/2 through httpx (requires httpx[http2])
+HTTP2_MAX_CONNECTIONS = 32  # Used for REST calls when USE_HTTP2 is set
+
+# Logging Parameters
+STATUS_LOG_INTERVAL_SECONDS = 1  # Throttle for the per-update status lines, which would otherwise log on every depth update
+
+# User Data Stream Parameters
+STREAM_RETRY_SECONDS = 5  # Back-off before resubscribing after a stream error
+OPEN_ORDERS_RECONCILE_SECONDS = 300  # Full REST resync of open orders to correct any drift
+BALANCE_SETTLE_TIMEOUT_SECONDS = 15  # Longest wait for a filled buy to be credited before selling
+
+# Order Status Parameters
+ORDER_STATUS_POLL_SECONDS = 2  # A tracked trade is checked over REST at most this often, not on every depth update
+
+# Order Submission Parameters
+RECV_WINDOW_MS = 5000  # Binance rejects signed requests older than this with -1021
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize Binance API with rate limiting
-exchange = ccxt.binance({
+class Http2Binance(ccxtpro.binance):
+    # Sends REST requests through an HTTP/2 httpx client so concurrent calls share one
+    # multiplexed connection; websockets still go through ccxt's aiohttp session
+
+    def __init__(self, config={}):
+        super().__init__(config)
+        self.http2_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=HTTP2_MAX_CONNECTIONS, max_keepalive_connections=HTTP2_MAX_CONNECTIONS),
+            timeout=self.timeout / 1000,
+            verify=ssl.create_default_context(cafile=self.cafile) if self.verify else False
+        )
+
+    async def fetch(self, url, method='GET', headers=None, body=None):
+        # Proxies are only implemented on ccxt's aiohttp path, so hand those requests back to it
+        httpProxy, httpsProxy, socksProxy = self.check_proxy_settings(url, method, headers, body)
+        if httpProxy or httpsProxy or socksProxy or self.aiohttp_proxy or self.check_proxy_url_settings(url, method, headers, body):
+            return await super().fetch(url, method, headers, body)
+        self.open(True)  # Binds the event loop and throttler, and raises ExchangeClosedByUser after close(), as ccxt's fetch does
+        request_headers = self.prepare_request_headers(headers)
+        self.last_request_headers = request_headers
+        if self.verbose:
+            self.log("\nfetch Request:", self.id, method, url, "RequestHeaders:", request_headers, "RequestBody:", body)
+        self.logger.debug("%s %s, Request: %s %s", method, url, headers, body)
+        try:
+            response = await self.http2_client.request(method, url, headers=request_headers, content=body.encode() if body else None)
+        except httpx.TimeoutException as e:
+            raise ccxt.RequestTimeout(' '.join([self.id, method, url])) from e
+        except httpx.TransportError as e:
+            raise ccxt.ExchangeNotAvailable(' '.join([self.id, method, url])) from e
+
+        http_status_code = response.status_code
+        http_status_text = response.reason_phrase
+        response_headers = dict(response.headers)
+        http_response = self.on_rest_response(http_status_code, http_status_text, url, method, response_headers, response.text, request_headers, body)
+        json_response = self.parse_json(http_response)
+        if self.enableLastHttpResponse:
+            self.last_http_response = http_response
+        if self.enableLastResponseHeaders:
+            self.last_response_headers = response_headers
+        if self.enableLastJsonResponse:
+            self.last_json_response = json_response
+        if self.verbose:
+            self.log("\nfetch Response:", self.id, method, url, http_status_code, "ResponseHeaders:", response_headers, "ResponseBody:", http_response)
+        self.logger.debug("%s %s, Response: %s %s %s", method, url, http_status_code, response_headers, http_response)
+
+        self.handle_errors(http_status_code, http_status_text, url, method, response_headers, http_response, json_response, request_headers, body)
+        self.handle_http_status_code(http_status_code, http_status_text, url, method, http_response)
+        if json_response is not None:
+            return json_response
+        return http_response
+
+    async def close(self, *args, **kwargs):
+        await self.http2_client.aclose()
+        await super().close(*args, **kwargs)
+
+if USE_HTTP2 and httpx is None:
+    logger.warning("USE_HTTP2 is set but httpx[http2] is not installed. Falling back to HTTP/1.1.")
+
+# Initialize Binance API with rate limiting (ccxt.pro streams market data over websockets)
+exchange = (Http2Binance if USE_HTTP2 and httpx is not None else ccxtpro.binance)({
     'apiKey': os.getenv('BINANCE_API_KEY'),
     'secret': os.getenv('BINANCE_API_SECRET'),
     'enableRateLimit': True,
-    'rateLimit': int((60 / MAX_REQUESTS_PER_MINUTE) * 1000 / RATE_LIMIT_SAFETY_FACTOR)
+    'rateLimit': int((60 / MAX_REQUESTS_PER_MINUTE) * 1000 / RATE_LIMIT_SAFETY_FACTOR),
+    'options': {
+        'adjustForTimeDifference': True,  # Keep local clock skew from eating into recvWindow
+        'watchBalance': {'fetchBalanceSnapshot': True}  # Seed the balance stream with a full snapshot
+    }
 })
 
+# Account state pushed over the Binance user data stream
+balance_cache = {}
+balance_updated = None  # asyncio.Event set whenever the balance stream delivers an update; created in main()
+open_order_ids = set()  # Also updated locally on place/fill so no REST call is needed per tick
+stream_closed_order_ids = set()  # Ids the order stream reported as finished, possibly before their REST placement returned
+CLOSED_ORDER_STATUSES = ('closed', 'canceled', 'expired', 'rejected')
+
+def parse_json(http_response):
+    # Same contract as ccxt's Exchange.parse_json, but decoded with orjson
+    try:
+        if exchange.is_json_encoded_object(http_response):
+            return orjson.loads(http_response)
+    except ValueError:
+        pass
+    return None
+
+if orjson is not None:
+    exchange.parse_json = parse_json
+
+def open_http_session():
+    # Replace ccxt's default connector with a larger keep-alive pool so websocket connections and,
+    # without httpx, bursts of REST calls reuse live sockets instead of paying a fresh TCP+TLS handshake
+    exchange.tcp_connector = aiohttp.TCPConnector(
+        ssl=ssl.create_default_context(cafile=exchange.cafile),
+        limit=HTTP_POOL_SIZE,
+        limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        enable_cleanup_closed=True
+    )
+    exchange.session = aiohttp.ClientSession(connector=exchange.tcp_connector, trust_env=exchange.aiohttp_trust_env)
+
 # Load markets data
-def load_markets_data():
+async def load_markets_data(reload=False):
     try:
-        exchange.load_markets()
+        await exchange.load_markets(reload)
         return exchange.markets
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
     return None
 
-market_data = load_markets_data()
+market_data = None  # Loaded by refresh_markets() before trading starts
+
+# Exchange rules for the traded symbol, resolved once so validate_order avoids nested dict lookups
+SymbolMeta = collections.namedtuple('SymbolMeta', 'min_amount price_prec amount_prec lot_step min_notional')
+symbol_meta = None
+
+def build_symbol_meta(market):
+    return SymbolMeta(
+        market['limits']['amount']['min'],
+        market['precision']['price'],
+        market['precision']['amount'],
+        market['limits']['amount'].get('step'),  # Lot size step (if available)
+        market['limits']['cost']['min']
+    )
+
+async def refresh_markets(reload=False):
+    # Only called at startup, on SIGHUP and when the exchange rejects an order as invalid,
+    # so validate_order can rely on symbol_meta being populated
+    global market_data, symbol_meta
+    markets = await load_markets_data(reload)
+    if markets is None:
+        markets = await load_markets_data(reload)  # One retry before giving up
+    if markets is None:
+        return False
+    market_data = markets
+    symbol_meta = build_symbol_meta(markets[SYMBOL])
+    return True
 
-def fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH):
+async def fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH):
     try:
-        return exchange.fetch_order_book(symbol, limit=limit)
+        # Resolves on the next depth update pushed over the websocket
+        return await exchange.watch_order_book(symbol, limit=limit)
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
     return None
 
 def analyze_order_book(order_book):
@@ -75,19 +239,19 @@ def analyze_order_book(order_book):
     best_ask_price, best_ask_volume = asks[0]
     best_bid_price, best_bid_volume = bids[0]
     
-    # Calculate buy/sell volume imbalance
-    total_bid_volume = sum(volume for price, volume in bids)
-    total_ask_volume = sum(volume for price, volume in asks)
-    volume_imbalance = total_bid_volume / total_ask_volume
+    # Calculate buy/sell volume imbalance (vectorized over the [price, volume] levels)
+    total_bid_volume = float(np.asarray(bids, dtype=np.float64)[:, 1].sum())
+    total_ask_volume = float(np.asarray(asks, dtype=np.float64)[:, 1].sum())
+    volume_imbalance = (total_bid_volume - total_ask_volume) / (total_bid_volume + total_ask_volume)
 
     # Calculate ideal exit price based on profit percentage
-    min_exit_price = best_ask_price * (1 + PROFIT_PERCENTAGE)
+    min_exit_price = best_ask_price * PROFIT_MULTIPLIER
     
     # Determine market condition
     market_condition = 'neutral'
-    if volume_imbalance > VOLUME_IMBALANCE_THRESHOLD:
+    if volume_imbalance > SIGNED_IMBALANCE_THRESHOLD:
         market_condition = 'bullish'
-    elif volume_imbalance < 1 / VOLUME_IMBALANCE_THRESHOLD:
+    elif volume_imbalance < -SIGNED_IMBALANCE_THRESHOLD:
         market_condition = 'bearish'
     
     return {
@@ -98,130 +262,193 @@ def analyze_order_book(order_book):
     }
 
 def validate_order(symbol, side, price, amount):
-    global market_data
-    if market_data is None:
-        market_data = load_markets_data()
-        if market_data is None:
-            return False
-
-    market = market_data[symbol]
+    meta = symbol_meta
 
     # Minimum order size
-    if amount < market['limits']['amount']['min']:
-        logger.error(f"Order amount {amount} is less than minimum allowed {market['limits']['amount']['min']}.")
+    if amount < meta.min_amount:
+        logger.error("Order amount %s is less than minimum allowed %s.", amount, meta.min_amount)
         return False
 
-    # Price and quantity precision
-    price_precision = market['precision']['price']
-    amount_precision = market['precision']['amount']
-    price = round(price, price_precision)
-    amount = round(amount, amount_precision)
+    # Price and quantity precision, quantized exactly only at submission time
+    price = float(ccxt.decimal_to_precision(price, ccxt.ROUND, meta.price_prec, exchange.precisionMode))
+    amount = float(ccxt.decimal_to_precision(amount, ccxt.TRUNCATE, meta.amount_prec, exchange.precisionMode))
 
     # Lot size step (if available)
-    lot_size_step = market['limits']['amount'].get('step')
-    if lot_size_step and amount % lot_size_step != 0:
-        logger.error(f"Order amount {amount} is not a multiple of lot size step {lot_size_step}.")
+    if meta.lot_step and amount % meta.lot_step != 0:
+        logger.error("Order amount %s is not a multiple of lot size step %s.", amount, meta.lot_step)
         return False
 
     # Notional value
     notional = price * amount
-    if notional < market['limits']['cost']['min']:
-        logger.error(f"Order notional {notional} is less than minimum allowed {market['limits']['cost']['min']}.")
+    if notional < meta.min_notional:
+        logger.error("Order notional %s is less than minimum allowed %s.", notional, meta.min_notional)
         return False
 
     return price, amount
 
-def place_order(symbol, side, price, amount):
-    logger.info(f"Placing {side} order: {amount:.8f} {symbol} at {price:.8f}")
+async def place_order(symbol, side, price, amount):
+    logger.info("Placing %s order: %.8f %s at %.8f", side, amount, symbol, price)
     validation = validate_order(symbol, side, price, amount)
     if not validation:
         return None
     price, amount = validation
     try:
         if side == 'buy':
-            order = exchange.create_limit_buy_order(symbol, amount, price)
+            order = await exchange.create_limit_buy_order(symbol, amount, price, params={'recvWindow': RECV_WINDOW_MS})
         else:
-            order = exchange.create_limit_sell_order(symbol, amount, price)
-        logger.info(f"Order placed: {order}")
+            order = await exchange.create_limit_sell_order(symbol, amount, price, params={'recvWindow': RECV_WINDOW_MS})
+        logger.info("Order placed: %s", order)
+        # An order that filled on placement may already have been reported by the order stream,
+        # either in the REST response itself or as a stream event that arrived before it
+        if order and order['status'] not in CLOSED_ORDER_STATUSES and order['id'] not in stream_closed_order_ids:
+            open_order_ids.add(order['id'])
+        if order:
+            stream_closed_order_ids.discard(order['id'])
         return order
     except ccxt.InsufficientFunds as e:
-        logger.error(f"Insufficient funds: {e}")
+        logger.error("Insufficient funds: %s", e)
+    except ccxt.InvalidOrder as e:
+        logger.error("Invalid order: %s", e)
+        await refresh_markets(reload=True)  # The symbol's trading rules may have changed
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
     return None
 
-def update_order_status(order):
+async def update_order_status(order):
     try:
-        order_info = exchange.fetch_order(order['id'], order['symbol'])
+        order_info = await exchange.fetch_order(order['id'], order['symbol'])
         order.update(order_info)
+        if order.get('status') in CLOSED_ORDER_STATUSES:
+            open_order_ids.discard(order['id'])
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
     return order
 
-def fetch_balances():
+async def fetch_balances():
+    # Served from the user data stream once it has been seeded; REST is only the cold-start path
+    if balance_cache:
+        return balance_cache['total']['USDT'], balance_cache['total'][SYMBOL.split('/')[0]]
     try:
-        balance_info = exchange.fetch_balance()
+        balance_info = await exchange.fetch_balance()
+        balance_cache.update(balance_info)
         usdt_balance = balance_info['total']['USDT']
         symbol_balance = balance_info['total'][SYMBOL.split('/')[0]]
         return usdt_balance, symbol_balance
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
     return None, None
 
-def check_open_orders(symbol):
+async def load_open_orders(symbol):
+    # REST resync of the local open-order set; used at startup and for periodic reconciliation
     try:
-        open_orders = exchange.fetch_open_orders(symbol)
-        return len(open_orders) > 0
+        open_orders = await exchange.fetch_open_orders(symbol)
+        open_order_ids.clear()
+        open_order_ids.update(order['id'] for order in open_orders)
+        stream_closed_order_ids.clear()  # The REST snapshot supersedes anything the stream reported before it
+        return True
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
-    return True  # Assume there are open orders if we can't fetch
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
+    return False
+
+def check_open_orders(symbol):
+    return bool(open_order_ids)
 
-def live_trading(symbol):
-    balance, symbol_balance = fetch_balances()
+async def watch_balance_loop():
+    while True:
+        try:
+            balance_cache.update(await exchange.watch_balance())
+            balance_updated.set()
+        except ccxt.NetworkError as e:
+            logger.error("Balance stream network error: %s", e)
+            await asyncio.sleep(STREAM_RETRY_SECONDS)
+        except ccxt.ExchangeError as e:
+            logger.error("Balance stream exchange error: %s", e)
+            await asyncio.sleep(STREAM_RETRY_SECONDS)
+
+async def watch_orders_loop(symbol):
+    while True:
+        try:
+            for order in await exchange.watch_orders(symbol):
+                if order['status'] == 'open':
+                    open_order_ids.add(order['id'])
+                else:
+                    open_order_ids.discard(order['id'])
+                    stream_closed_order_ids.add(order['id'])
+        except ccxt.NetworkError as e:
+            logger.error("Order stream network error: %s", e)
+            await asyncio.sleep(STREAM_RETRY_SECONDS)
+        except ccxt.ExchangeError as e:
+            logger.error("Order stream exchange error: %s", e)
+            await asyncio.sleep(STREAM_RETRY_SECONDS)
+
+async def wait_for_balance_change(asset, previous_total, timeout=BALANCE_SETTLE_TIMEOUT_SECONDS):
+    # Returns as soon as the streamed balance of `asset` differs from previous_total, or after timeout.
+    # Awaiting here keeps the event loop free, so the order book and user data streams stay current.
+    async def changed():
+        while balance_cache['total'].get(asset) == previous_total:
+            balance_updated.clear()
+            await balance_updated.wait()
+    try:
+        await asyncio.wait_for(changed(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("No %s balance update within %ss. Continuing with the cached balance.", asset, timeout)
+
+async def reconcile_open_orders_loop(symbol):
+    while True:
+        await asyncio.sleep(OPEN_ORDERS_RECONCILE_SECONDS)
+        await load_open_orders(symbol)
+
+async def live_trading(symbol):
+    balance, symbol_balance = await fetch_balances()
     if balance is None or symbol_balance is None:
         logger.error("Failed to fetch initial balances. Exiting.")
         return
 
     active_trade = None
-    last_api_call_time = time.time()
+    symbol_balance_before_buy = symbol_balance
     previous_market_condition = 'neutral'
+    last_order_poll_time = 0.0
+    last_status_log_time = 0.0
 
     while True:
-        time_since_last_call = time.time() - last_api_call_time
-        if time_since_last_call < TRADE_INTERVAL_SECONDS:
-            time.sleep(TRADE_INTERVAL_SECONDS - time_since_last_call)
-        
-        if check_open_orders(symbol):
-            logger.info("Open orders found. Skipping this iteration.")
-            continue
-        
-        order_book = fetch_order_book(symbol)
-        last_api_call_time = time.time()
+        # Blocks until the exchange pushes the next order book update
+        order_book = await fetch_order_book(symbol)
         
         if order_book is None:
             logger.warning("Failed to fetch order book. Skipping this iteration.")
             continue
 
+        # The per-update status lines are only built at most once per STATUS_LOG_INTERVAL_SECONDS
+        now = time.monotonic()
+        log_status = now - last_status_log_time >= STATUS_LOG_INTERVAL_SECONDS and logger.isEnabledFor(logging.INFO)
+        if log_status:
+            last_status_log_time = now
+
+        if check_open_orders(symbol):
+            if log_status:
+                logger.info("Open orders found. Skipping this iteration.")
+            continue
+
         analysis = analyze_order_book(order_book)
         if analysis is None:
             logger.warning("Failed to analyze order book. Skipping this iteration.")
@@ -229,34 +456,41 @@ def live_trading(symbol):
         
         current_price = order_book['asks'][0][0]  # Current market price based on the first ask
 
-        logger.info(f"Market condition: {analysis['market_condition']}")
-
-        # Calculate symbol balance in USDT equivalent
-        symbol_balance_usdt_equiv = symbol_balance * current_price
+        if log_status:
+            logger.info("Market condition: %s", analysis['market_condition'])
 
-        if (previous_market_condition in ['neutral', 'bearish'] and 
+        # Cheap market-condition checks first; the symbol balance in USDT equivalent
+        # is only computed on the rare ticks where the market flips to bullish
+        if (previous_market_condition in {'neutral', 'bearish'} and 
             analysis['market_condition'] == 'bullish' and 
-            symbol_balance_usdt_equiv < MAX_SYMBOL_BALANCE_USDT_EQUIV):
+            symbol_balance * current_price < MAX_SYMBOL_BALANCE_USDT_EQUIV):
             # Bullish trend detected from neutral or bearish market condition
             if active_trade is None and balance >= TRADE_AMOUNT:
                 buy_price = analysis['best_ask_price']
                 amount_to_buy = TRADE_AMOUNT / buy_price
-                active_trade = place_order(symbol, 'buy', buy_price, amount_to_buy)
+                symbol_balance_before_buy = symbol_balance
+                active_trade = await place_order(symbol, 'buy', buy_price, amount_to_buy)
                 if active_trade is not None:
-                    logger.info(f"Placing buy order at best ask price: {buy_price:.8f}")
+                    logger.info("Placing buy order at best ask price: %.8f", buy_price)
                     balance -= buy_price * amount_to_buy
 
-        if active_trade and active_trade['side'] == 'buy':
-            active_trade = update_order_status(active_trade)
+        # fetch_order is a weighted REST call, so it is throttled rather than sent on every update
+        now = time.monotonic()
+        poll_order = active_trade is not None and now - last_order_poll_time >= ORDER_STATUS_POLL_SECONDS
+        if poll_order:
+            last_order_poll_time = now
+
+        if poll_order and active_trade['side'] == 'buy':
+            active_trade = await update_order_status(active_trade)
             if active_trade['status'] == 'closed':
-                logger.info(f"BUY filled at {active_trade['price']:.8f}")
+                logger.info("BUY filled at %.8f", active_trade['price'])
                 symbol_balance += active_trade['amount']
                 
-                # Wait 15 seconds before placing the sell order
-                time.sleep(15)
+                # Wait for the bought amount to be credited (up to BALANCE_SETTLE_TIMEOUT_SECONDS) before selling
+                await wait_for_balance_change(symbol.split('/')[0], symbol_balance_before_buy)
 
                 # Fetch the latest balances
-                balance, updated_symbol_balance = fetch_balances()
+                balance, updated_symbol_balance = await fetch_balances()
 
                 # Round down symbol balance to two decimal places
                 rounded_symbol_balance = floor(updated_symbol_balance * 100) / 100
@@ -265,33 +499,56 @@ def live_trading(symbol):
                 min_sell_price = analysis['min_exit_price']
 
                 # Check balance before placing the sell order
-                balance, current_symbol_balance = fetch_balances()
+                balance, current_symbol_balance = await fetch_balances()
                 if current_symbol_balance >= rounded_symbol_balance:
                     # Place a sell order at the target price
-                    sell_order = place_order(symbol, 'sell', min_sell_price, rounded_symbol_balance)
+                    sell_order = await place_order(symbol, 'sell', min_sell_price, rounded_symbol_balance)
                     if sell_order is not None:
-                        logger.info(f"Placing sell order: {rounded_symbol_balance:.8f} {symbol} at {min_sell_price:.8f}")
+                        logger.info("Placing sell order: %.8f %s at %.8f", rounded_symbol_balance, symbol, min_sell_price)
+                        active_trade = sell_order  # Track the sell from here on, instead of re-reporting the filled buy
                 else:
-                    logger.error(f"Insufficient balance for placing sell order: required {rounded_symbol_balance:.8f}, available {current_symbol_balance:.8f}")
+                    logger.error("Insufficient balance for placing sell order: required %.8f, available %.8f", rounded_symbol_balance, current_symbol_balance)
 
-        if active_trade and active_trade['side'] == 'sell':
-            active_trade = update_order_status(active_trade)
+        elif poll_order and active_trade['side'] == 'sell':
+            active_trade = await update_order_status(active_trade)
             if active_trade['status'] == 'closed':
                 # Fetch the latest balances before updating
-                balance, symbol_balance = fetch_balances()
-                logger.info(f"SELL filled at {active_trade['price']:.8f}")
+                balance, symbol_balance = await fetch_balances()
+                logger.info("SELL filled at %.8f", active_trade['price'])
                 active_trade = None  # Ready for the next trade cycle
 
-        balance, symbol_balance = fetch_balances()
-        total_value = balance + symbol_balance * current_price
-        logger.info(f"Current Balance: {balance:.2f} USDT, "
-                    f"Symbol Balance: {symbol_balance:.8f}, "
-                    f"Total Value: {total_value:.2f}")
+        balance, symbol_balance = await fetch_balances()
+        if log_status:
+            total_value = balance + symbol_balance * current_price
+            logger.info("Current Balance: %.2f USDT, "
+                        "Symbol Balance: %.8f, "
+                        "Total Value: %.2f", balance, symbol_balance, total_value)
 
         previous_market_condition = analysis['market_condition']
 
-def main():
-    live_trading(SYMBOL)
+async def main():
+    global balance_updated
+    balance_updated = asyncio.Event()
+    open_http_session()
+    if not await refresh_markets():
+        await exchange.close()
+        raise RuntimeError("Markets data unavailable. Refusing to start trading.")
+    if hasattr(signal, 'SIGHUP'):
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGHUP, lambda: asyncio.ensure_future(refresh_markets(reload=True))
+        )
+    await load_open_orders(SYMBOL)
+    watchers = [
+        asyncio.create_task(watch_balance_loop()),
+        asyncio.create_task(watch_orders_loop(SYMBOL)),
+        asyncio.create_task(reconcile_open_orders_loop(SYMBOL))
+    ]
+    try:
+        await live_trading(SYMBOL)
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+        await exchange.close()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
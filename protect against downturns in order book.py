@@ -3,7 +3,7 @@
 
 ## Overview
 
-This trading bot is designed to perform live trading on the Binance exchange for the `1000SATS/USDT` trading pair. The bot uses the `ccxt` library to interact with the Binance API and bases its trading decisions purely on order book analysis. The primary goal is to buy and sell based on detected market conditions, volume imbalances, and the presence of large orders (whales).
+This trading bot is designed to perform live trading on the Binance exchange for the `1000SATS/USDT` trading pair. The bot uses the `ccxt` library (and `ccxt.pro` for websocket streaming) to interact with the Binance API and bases its trading decisions purely on order book analysis. The primary goal is to buy and sell based on detected market conditions, volume imbalances, and the presence of large orders (whales).
 
 ## Strategy
 
@@ -21,20 +21,27 @@ The bot makes trading decisions based on the following strategy:
 ## Configuration Parameters
 
 - `SYMBOL`: The trading pair (default is `1000SATS/USDT`).
-- `ORDER_BOOK_DEPTH`: Number of levels in the order book to analyze (default is 100).
+- `ORDER_BOOK_DEPTH`: Number of order book levels to stream; the top 10 are analyzed and the rest are used to find a sell price (default is 20).
 - `TRADE_AMOUNT`: Fixed amount in USDT to trade each time (default is 100).
-- `TRADE_INTERVAL_SECONDS`: Interval between trade checks (default is 1 second).
 - `PROFIT_PERCENTAGE`: Minimum profit target for selling (default is 0.44%).
-- `VOLUME_IMBALANCE_THRESHOLD`: Threshold for detecting volume imbalances (default is 1.2).
+- `VOLUME_IMBALANCE_THRESHOLD`: Bid/ask volume ratio for detecting volume imbalances (default is 1.2). Applied as the equivalent bound on the signed imbalance `(B - A) / (B + A)`.
 - `SELL_WALL_THRESHOLD`: Threshold for detecting large sell walls (default is 1.5).
 - `LARGE_ORDER_THRESHOLD`: Threshold for detecting large orders (default is 1% of total volume).
 - `MIN_SELL_BALANCE_USDT`: Minimum balance in USDT equivalent to initiate a sell (default is 50 USDT).
+- `STREAM_RETRY_SECONDS`: Back-off before resubscribing after a user data stream error (default is 5).
+- `BALANCE_RECONCILE_SECONDS`: Interval between REST resyncs of the streamed balances (default is 60).
+- `STATUS_LOG_INTERVAL_SECONDS`: Minimum interval between the per-update market condition and balance status log lines (default is 1).
+- `HTTP_POOL_SIZE` / `HTTP_POOL_SIZE_PER_HOST` / `HTTP_KEEPALIVE_SECONDS`: Size and keep-alive of the shared connection pool (defaults are 64, 32 and 60 seconds).
 
 ## Functions
 
+### `open_http_session()` / `load_markets()`
+
+Install a shared keep-alive connection pool on the exchange and pre-load the markets at startup, so the first order does not pay for a TLS handshake and a markets request.
+
 ### `fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH)`
 
-Fetches the order book for the specified symbol and depth. Handles network, exchange, and rate limit errors.
+Waits for the next order book update for the specified symbol and depth, streamed over the Binance websocket via `ccxt.pro`. Handles network, exchange, and rate limit errors.
 
 ### `analyze_order_book(order_book)`
 
@@ -43,28 +50,35 @@ Analyzes the top 10 levels of the order book to determine:
 - Presence of large sell walls.
 - Large orders in bids and asks.
 - Ideal exit price for a profitable sell.
+- Sell price: the first streamed ask above the exit price (binary search over the sorted asks), or the exit price itself.
 - Market condition (bullish, bearish, or neutral).
 
+Returns the previous result unchanged when none of the levels it reads have changed since the last call.
+
 ### `place_order(symbol, side, amount, price=None)`
 
-Places a limit buy or sell order on the exchange. Logs the order details and handles errors.
+Places a limit buy or sell order on the exchange. Logs the order details and handles errors. After a successful placement the order's funds are taken out of the cached free balance, so the next order book update cannot re-send the same order before the balance stream reports them as locked.
+
+### `load_balances()`
+
+Fetches a REST balance snapshot into the balance cache. Used on cold start and for periodic reconciliation. Handles errors.
 
-### `get_current_balance(asset)`
+### `get_current_balances(assets)`
 
-Fetches the current available balance of the specified asset. Handles errors.
+Returns the current available balances of the specified assets from the balance cache, loading it over REST if the stream has not seeded it yet.
 
-### `check_open_orders(symbol)`
+### `watch_balance_loop()` / `reconcile_balances_loop()`
 
-Checks for any open orders for the specified symbol. Returns `True` if there are open orders, `False` otherwise.
+Keep the balance cache current from the Binance user data stream, with a periodic REST resync in case an update is missed.
 
 ### `cancel_all_orders(symbol)`
 
-Cancels all open orders for the specified symbol. Handles errors and logs the cancellations.
+Cancels all open orders for the specified symbol with a single cancel-all request, falling back to concurrent per-order cancellations on exchanges without that endpoint. Handles errors and logs the cancellations.
 
 ### `trading_bot(symbol)`
 
 The main trading bot function:
-- Checks the order book and market conditions at regular intervals.
+- Checks the order book and market conditions on every order book update pushed by the exchange.
 - Places buy orders when market conditions change to bullish.
 - Places sell orders when profit targets are met or market conditions change to bearish. Ensures sufficient balance to sell.
 - Cancels and replaces orders based on real-time analysis of the order book.
@@ -73,8 +87,9 @@ The main trading bot function:
 
 1. **Install Dependencies**: Ensure you have `ccxt`, `python-dotenv`, and other required libraries installed.
     ```bash
-    pip install ccxt python-dotenv
+    pip install ccxt numpy python-dotenv
     ```
+    Installing `uvloop` is optional; when present the bot runs on it instead of the default asyncio event loop.
 
 2. **Set Up Environment Variables**: Create a `.env` file with your Binance API credentials.
     ```
@@ -101,19 +116,29 @@ Feel free to modify the parameters and improve the strategy according to your ne
 """
 
 import os
+import asyncio
+import collections
+import ssl
+import aiohttp
 import ccxt
+import ccxt.pro as ccxtpro
+import numpy as np
 import time
 import logging
 from dotenv import load_dotenv
 
+try:
+    import uvloop  # Optional: libuv-based event loop with cheaper task scheduling and socket I/O
+except ImportError:
+    uvloop = None
+
 # Load environment variables
 load_dotenv()
 
 # Configurable Parameters
 SYMBOL = '1000SATS/USDT'
-ORDER_BOOK_DEPTH = 100  # Increased for more comprehensive analysis
+ORDER_BOOK_DEPTH = 20  # Smallest Binance depth limit covering the top 10 analyzed levels plus headroom for the sell-price scan
 TRADE_AMOUNT = 100  # Fixed amount in USDT to trade each time
-TRADE_INTERVAL_SECONDS = 1  # Check every second
 PROFIT_PERCENTAGE = 0.0044  # Minimum 0.44% profit target
 
 # Order Book Analysis Parameters
@@ -121,6 +146,11 @@ VOLUME_IMBALANCE_THRESHOLD = 1.2  # 20% more volume on buy side than sell side
 SELL_WALL_THRESHOLD = 1.5  # Ratio indicating a large sell wall
 LARGE_ORDER_THRESHOLD = 0.01  # 1% of total volume as a large order
 
+# Derived constants, folded once instead of on every order book update
+# Bid/ask ratio threshold T expressed on the signed (B - A) / (B + A) scale: B / A > T <=> imbalance > (T - 1) / (T + 1)
+SIGNED_IMBALANCE_THRESHOLD = (VOLUME_IMBALANCE_THRESHOLD - 1) / (VOLUME_IMBALANCE_THRESHOLD + 1)
+PROFIT_MULTIPLIER = 1 + PROFIT_PERCENTAGE
+
 # Minimum balance in USDT equivalent to initiate a sell
 MIN_SELL_BALANCE_USDT = 50
 
@@ -128,172 +158,294 @@ MIN_SELL_BALANCE_USDT = 50
 MAX_REQUESTS_PER_MINUTE = 1200
 RATE_LIMIT_SAFETY_FACTOR = 0.75
 
+# Connection Pool Parameters
+HTTP_POOL_SIZE = 64  # Maximum open connections across all hosts
+HTTP_POOL_SIZE_PER_HOST = 32
+HTTP_KEEPALIVE_SECONDS = 60
+
+# Logging Parameters
+STATUS_LOG_INTERVAL_SECONDS = 1  # Throttle for the per-update status lines, which would otherwise log on every depth update
+
+# User Data Stream Parameters
+STREAM_RETRY_SECONDS = 5  # Back-off before resubscribing after a stream error
+BALANCE_RECONCILE_SECONDS = 60  # Periodic REST resync of the streamed balances
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize Binance API with rate limiting
-exchange = ccxt.binance({
+# Initialize Binance API with rate limiting (ccxt.pro streams market data over websockets)
+exchange = ccxtpro.binance({
     'apiKey': os.getenv('BINANCE_API_KEY'),
     'secret': os.getenv('BINANCE_API_SECRET'),
     'enableRateLimit': True,
-    'rateLimit': int((60 / MAX_REQUESTS_PER_MINUTE) * 1000 / RATE_LIMIT_SAFETY_FACTOR)
+    'rateLimit': int((60 / MAX_REQUESTS_PER_MINUTE) * 1000 / RATE_LIMIT_SAFETY_FACTOR),
+    'options': {
+        'watchBalance': {'fetchBalanceSnapshot': True}  # Seed the balance stream with a full snapshot
+    }
 })
 
-def fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH):
+# Account balances pushed over the Binance user data stream
+balance_cache = {}
+
+def open_http_session():
+    # Replace ccxt's default connector with a larger keep-alive pool so websocket connections and
+    # REST calls reuse live sockets instead of paying a fresh TCP+TLS handshake
+    exchange.tcp_connector = aiohttp.TCPConnector(
+        ssl=ssl.create_default_context(cafile=exchange.cafile),
+        limit=HTTP_POOL_SIZE,
+        limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        enable_cleanup_closed=True
+    )
+    exchange.session = aiohttp.ClientSession(connector=exchange.tcp_connector, trust_env=exchange.aiohttp_trust_env)
+
+async def load_markets():
+    # Warm up the markets cache and the pooled connection before the first order needs them
     try:
-        return exchange.fetch_order_book(symbol, limit=limit)
+        await exchange.load_markets()
+    except ccxt.BaseError as e:
+        logger.error("Error loading markets: %s", e)
+
+async def fetch_order_book(symbol, limit=ORDER_BOOK_DEPTH):
+    try:
+        # Resolves on the next depth update pushed over the websocket
+        return await exchange.watch_order_book(symbol, limit=limit)
     except ccxt.NetworkError as e:
-        logger.error(f"Network error: {e}")
+        logger.error("Network error: %s", e)
     except ccxt.ExchangeError as e:
-        logger.error(f"Exchange error: {e}")
+        logger.error("Exchange error: %s", e)
     except ccxt.RateLimitExceeded as e:
-        logger.error(f"Rate limit exceeded: {e}")
-        time.sleep(60)
+        logger.error("Rate limit exceeded: %s", e)
+        await asyncio.sleep(60)
     return None
 
+# Reused [price, volume] buffers, so analyzing an update does not allocate fresh arrays
+ask_buffer = np.empty((ORDER_BOOK_DEPTH, 2), dtype=np.float64)
+bid_buffer = np.empty((ORDER_BOOK_DEPTH, 2), dtype=np.float64)
+
+# Result of analyze_order_book; built once per changed book and read by attribute in the trading loop
+Analysis = collections.namedtuple('Analysis', 'best_ask_price best_bid_price min_exit_price sell_price market_condition large_sell_wall')
+
+# Levels behind the last analysis and its result; many depth updates leave the analyzed levels untouched
+last_asks = None
+last_bids = None
+last_analysis = None
+
+def fill_buffer(buffer, levels):
+    # Copy the levels into the front of a preallocated buffer and return that view. ccxt.pro only
+    # trims the book to the requested depth when it resolves, so deltas can briefly push it past that
+    if len(levels) > len(buffer):
+        levels = levels[:len(buffer)]
+    view = buffer[:len(levels)]
+    view[...] = levels
+    return view
+
 def analyze_order_book(order_book):
-    asks = order_book['asks'][:10]  # Top 10 asks
-    bids = order_book['bids'][:10]  # Top 10 bids
+    global last_asks, last_bids, last_analysis
+    asks = order_book['asks']  # Full streamed depth; the top 10 are analyzed, the rest extend the sell-price search
+    bids = order_book['bids'][:10]  # Top 10 bids; slicing the references is cheaper than converting levels never analyzed
     
     if not asks or not bids:
         logger.warning("Not enough asks or bids in the order book for analysis.")
         return None
     
-    # Calculate buy/sell volume imbalance
-    total_bid_volume = sum(volume for price, volume in bids)
-    total_ask_volume = sum(volume for price, volume in asks)
-    volume_imbalance = total_bid_volume / total_ask_volume
+    # Calculate buy/sell volume imbalance (vectorized over the [price, volume] levels)
+    asks_np = fill_buffer(ask_buffer, asks)
+    bids_np = fill_buffer(bid_buffer, bids)
+    if last_analysis is not None and np.array_equal(asks_np, last_asks) and np.array_equal(bids_np, last_bids):
+        return last_analysis
+    ask_volumes = asks_np[:10, 1]
+    bid_volumes = bids_np[:, 1]
+    total_bid_volume = float(bid_volumes.sum())
+    total_ask_volume = float(ask_volumes.sum())
+    volume_imbalance = (total_bid_volume - total_ask_volume) / (total_bid_volume + total_ask_volume)
+
+    # Per-book cutoffs, each computed once and compared against every level
+    sell_wall_cut = total_bid_volume / SELL_WALL_THRESHOLD
+    large_bid_cut = LARGE_ORDER_THRESHOLD * total_bid_volume
+    large_ask_cut = LARGE_ORDER_THRESHOLD * total_ask_volume
 
     # Detect large sell walls
-    large_sell_wall = any(volume > total_bid_volume / SELL_WALL_THRESHOLD for price, volume in asks)
+    large_sell_wall = bool((ask_volumes > sell_wall_cut).any())
 
-    # Detect large orders in the bids and asks
-    large_bid_order = any(volume > LARGE_ORDER_THRESHOLD * total_bid_volume for price, volume in bids)
-    large_ask_order = any(volume > LARGE_ORDER_THRESHOLD * total_ask_volume for price, volume in asks)
+    # Best ask (lowest ask price) and best bid (highest bid price); ccxt sorts asks ascending and bids descending
+    best_ask_price = float(asks_np[0, 0])
+    best_bid_price = float(bids_np[0, 0])
 
     # Calculate ideal exit price based on profit percentage
-    min_exit_price = min(ask[0] for ask in asks) * (1 + PROFIT_PERCENTAGE)
+    min_exit_price = best_ask_price * PROFIT_MULTIPLIER
+
+    # Sell level: first ask above the exit price, found on the same ask array (asks are sorted ascending)
+    ask_prices = asks_np[:, 0]
+    sell_idx = np.searchsorted(ask_prices, min_exit_price, side='right')
+    sell_price = float(ask_prices[sell_idx]) if sell_idx < len(ask_prices) else min_exit_price
     
-    # Determine market condition
+    # Determine market condition; the imbalance compares are checked first, so the
+    # large order scans only run when they can still change the outcome
     market_condition = 'neutral'
-    if large_sell_wall or volume_imbalance < 1 / VOLUME_IMBALANCE_THRESHOLD or large_ask_order:
+    if volume_imbalance < -SIGNED_IMBALANCE_THRESHOLD or large_sell_wall or (ask_volumes > large_ask_cut).any():
         market_condition = 'bearish'
-    elif volume_imbalance > VOLUME_IMBALANCE_THRESHOLD and large_bid_order:
+    elif volume_imbalance > SIGNED_IMBALANCE_THRESHOLD and (bid_volumes > large_bid_cut).any():
         market_condition = 'bullish'
     
-    return {
-        'best_ask_price': min(ask[0] for ask in asks),
-        'best_bid_price': max(bid[0] for bid in bids),
-        'min_exit_price': min_exit_price,
-        'market_condition': market_condition,
-        'large_sell_wall': large_sell_wall
-    }
-
-def place_order(symbol, side, amount, price=None):
+    last_asks = asks_np.copy()
+    last_bids = bids_np.copy()
+    last_analysis = Analysis(best_ask_price, best_bid_price, min_exit_price, sell_price, market_condition, large_sell_wall)
+    return last_analysis
+
+async def place_order(symbol, side, amount, price=None):
+    base, quote = symbol.split('/')
+    funds_asset = quote if side == 'buy' else base
+    free_before = balance_cache.get('free', {}).get(funds_asset)  # Compared after placement to spot a stream update
     try:
         if side == 'buy':
-            order = exchange.create_limit_buy_order(symbol, amount, price)
+            order = await exchange.create_limit_buy_order(symbol, amount, price)
         else:
-            order = exchange.create_limit_sell_order(symbol, amount, price)
-        logger.info(f"Placed {side} order: {amount:.8f} {symbol} at {price:.8f}")
+            order = await exchange.create_limit_sell_order(symbol, amount, price)
+        logger.info("Placed %s order: %.8f %s at %.8f", side, amount, symbol, price)
+        reserve_order_funds(funds_asset, amount * price if side == 'buy' else amount, free_before)
         return order
     except ccxt.BaseError as e:
-        logger.error(f"Error placing {side} order: {e}")
+        logger.error("Error placing %s order: %s", side, e)
         return None
 
-def get_current_balance(asset):
-    try:
-        balance = exchange.fetch_balance()
-        return balance['free'][asset]
-    except ccxt.BaseError as e:
-        logger.error(f"Error fetching balance: {e}")
-        return 0
-
-def check_open_orders(symbol):
+def reserve_order_funds(asset, funds, free_before):
+    # The balance stream reports the locked funds only after the order is acknowledged, and the next
+    # depth update can arrive first; take them out of the cached free balance now so the same order
+    # is not sent again. If the cached value already moved while the order was being placed, the
+    # stream has reported the lock and subtracting again would count the funds twice.
+    # The next streamed or REST balance overwrites this estimate.
+    free = balance_cache.get('free')
+    if free is None or free.get(asset) != free_before:
+        return
+    free[asset] = free_before - funds
+
+async def load_balances():
+    # REST snapshot of the balance cache; used at startup and for periodic reconciliation
     try:
-        open_orders = exchange.fetch_open_orders(symbol)
-        return len(open_orders) > 0
+        balance_cache.update(await exchange.fetch_balance())
+        return True
     except ccxt.BaseError as e:
-        logger.error(f"Error fetching open orders: {e}")
+        logger.error("Error fetching balance: %s", e)
         return False
 
-def cancel_all_orders(symbol):
+async def get_current_balances(assets):
+    # Served from the user data stream once it has been seeded; REST is only the cold-start path
+    if not balance_cache and not await load_balances():
+        return [0] * len(assets)
+    return [balance_cache['free'][asset] for asset in assets]
+
+async def watch_balance_loop():
+    while True:
+        try:
+            balance_cache.update(await exchange.watch_balance())
+        except ccxt.BaseError as e:
+            logger.error("Balance stream error: %s", e)
+            await asyncio.sleep(STREAM_RETRY_SECONDS)
+
+async def reconcile_balances_loop():
+    while True:
+        await asyncio.sleep(BALANCE_RECONCILE_SECONDS)
+        await load_balances()
+
+async def cancel_all_orders(symbol):
     try:
-        orders = exchange.fetch_open_orders(symbol)
-        for order in orders:
-            exchange.cancel_order(order['id'], symbol)
-        logger.info(f"Cancelled all open orders for {symbol}")
+        if exchange.has['cancelAllOrders']:
+            # A single DELETE /openOrders request, with no fetch_open_orders round trip first
+            await exchange.cancel_all_orders(symbol)
+        else:
+            orders = await exchange.fetch_open_orders(symbol)
+            # Send the cancellations concurrently rather than one round trip after another
+            await asyncio.gather(*(exchange.cancel_order(order['id'], symbol) for order in orders))
+        logger.info("Cancelled all open orders for %s", symbol)
+    except ccxt.OrderNotFound:
+        # Binance rejects a cancel-all on a symbol with no open orders
+        logger.info("No open orders to cancel for %s", symbol)
     except ccxt.BaseError as e:
-        logger.error(f"Error cancelling orders: {e}")
-
-def trading_bot(symbol):
-    initial_balance = get_current_balance('USDT')  # Capture initial balance
-    last_api_call_time = time.time()
+        logger.error("Error cancelling orders: %s", e)
+
+async def trading_bot(symbol):
+    # Seed the balance cache once, so the loop below never falls back to a REST request per update
+    if not balance_cache and not await load_balances():
+        logger.error("Failed to fetch initial balances. Exiting.")
+        return
+    initial_balance, = await get_current_balances(('USDT',))  # Capture initial balance
     previous_market_condition = 'neutral'
+    last_status_log_time = 0.0
 
     while True:
-        time_since_last_call = time.time() - last_api_call_time
-        if time_since_last_call < TRADE_INTERVAL_SECONDS:
-            time.sleep(TRADE_INTERVAL_SECONDS - time_since_last_call)
-        
-        # Update balances
-        usdt_balance = get_current_balance('USDT')
-        symbol_balance = get_current_balance(symbol.split('/')[0])
-
-        order_book = fetch_order_book(symbol)
-        last_api_call_time = time.time()
+        # Blocks until the exchange pushes the next order book update
+        order_book = await fetch_order_book(symbol)
         
         if order_book is None:
             logger.warning("Failed to fetch order book. Skipping this iteration.")
             continue
 
+        # Analyze before any other await, while the book still holds the update that woke the loop
         analysis = analyze_order_book(order_book)
         if analysis is None:
             logger.warning("Failed to analyze order book. Skipping this iteration.")
             continue
+
+        # Balances are kept current by the user data stream, so reading them costs no request
+        usdt_balance, symbol_balance = await get_current_balances(('USDT', symbol.split('/')[0]))
         
-        current_price = order_book['asks'][0][0]  # Current market price based on the first ask
+        current_price = analysis.best_ask_price  # Current market price based on the first ask
 
-        logger.info(f"Market condition: {analysis['market_condition']}")
+        # The per-update status lines are only built at most once per STATUS_LOG_INTERVAL_SECONDS
+        now = time.monotonic()
+        log_status = now - last_status_log_time >= STATUS_LOG_INTERVAL_SECONDS and logger.isEnabledFor(logging.INFO)
+        if log_status:
+            last_status_log_time = now
+            logger.info("Market condition: %s", analysis.market_condition)
 
         # Buy condition: market condition must change from bearish or neutral to bullish
-        if previous_market_condition in ['neutral', 'bearish'] and analysis['market_condition'] == 'bullish':
+        if previous_market_condition in {'neutral', 'bearish'} and analysis.market_condition == 'bullish':
             if usdt_balance >= TRADE_AMOUNT:
-                buy_price = analysis['best_ask_price']
+                buy_price = analysis.best_ask_price
                 amount_to_buy = TRADE_AMOUNT / buy_price
-                place_order(symbol, 'buy', amount_to_buy, buy_price)
-                logger.info(f"Placing buy order at best ask price: {buy_price:.8f}")
+                await place_order(symbol, 'buy', amount_to_buy, buy_price)
+                logger.info("Placing buy order at best ask price: %.8f", buy_price)
 
-        previous_market_condition = analysis['market_condition']
+        previous_market_condition = analysis.market_condition
 
         # Sell condition: Only sell if the equivalent value in USDT is greater than MIN_SELL_BALANCE_USDT
         if symbol_balance * current_price >= MIN_SELL_BALANCE_USDT:
-            min_sell_price = analysis['min_exit_price']
-            # Find the highest possible sell price in the order book that meets the profit target
-            for ask_price, ask_volume in order_book['asks']:
-                if ask_price > min_sell_price:
-                    sell_price = ask_price
-                    break
-            else:
-                sell_price = min_sell_price
+            # First ask above the profit target, or the target itself if the book does not reach it
+            sell_price = analysis.sell_price
 
             amount_to_sell = round(symbol_balance, 8)  # Round down to avoid over-selling
-            place_order(symbol, 'sell', amount_to_sell, sell_price)
-            logger.info(f"Placing sell order at price: {sell_price:.8f}")
-        else:
+            await place_order(symbol, 'sell', amount_to_sell, sell_price)
+            logger.info("Placing sell order at price: %.8f", sell_price)
+        elif log_status:
             logger.info("Insufficient balance to sell.")
 
-        total_value = usdt_balance + symbol_balance * current_price
-        pnl = total_value - initial_balance  # Calculate PNL based on the initial balance
-
-        logger.info(f"Current Balance: {usdt_balance:.2f} USDT, "
-                    f"Symbol Balance: {symbol_balance:.8f}, "
-                    f"Total Value: {total_value:.2f}, "
-                    f"PNL: {pnl:.2f}")
-
-def main():
-    trading_bot(SYMBOL)
+        if log_status:
+            total_value = usdt_balance + symbol_balance * current_price
+            pnl = total_value - initial_balance  # Calculate PNL based on the initial balance
+
+            logger.info("Current Balance: %.2f USDT, "
+                        "Symbol Balance: %.8f, "
+                        "Total Value: %.2f, "
+                        "PNL: %.2f", usdt_balance, symbol_balance, total_value, pnl)
+
+async def main():
+    open_http_session()
+    await load_markets()
+    watchers = [
+        asyncio.create_task(watch_balance_loop()),
+        asyncio.create_task(reconcile_balances_loop())
+    ]
+    try:
+        await trading_bot(SYMBOL)
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+        await exchange.close()
 
 if __name__ == "__main__":
-    main()
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())